@@ -1,9 +1,12 @@
 """Basic example showing how to instantiate and run the KG-Agent skeleton."""
 
+import logging
+
 from kg_agent import Agent, ToolBox, KGExecutor, KGQueryTool, FinalAnswerTool
 
 
 def main() -> None:
+    logging.basicConfig(level=logging.INFO)
     # Create components
     kg = KGExecutor()
     # Load toy triples
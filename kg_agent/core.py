@@ -10,33 +10,157 @@ All methods contain TODO markers and simple mock behavior suitable for unit test
 """
 from __future__ import annotations
 
+from array import array
+from collections import OrderedDict, abc, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Protocol, Tuple
+from types import MappingProxyType
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Protocol, Sequence, Tuple, Union
+import asyncio
+import copy
+import functools
 import logging
+import os
+import re
+import sys
+import threading
+import time
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+# bounds for the Agent result cache
+RESULT_CACHE_SIZE = 1024
+SIMILARITY_THRESHOLD = 0.97
+# events kept per Agent run trace
+TRACE_SIZE = 256
 
 
 class Tool(Protocol):
     """Protocol for toolbox tools.
 
     Concrete tools should implement execute which takes a string instruction and optional context.
+    Tools may additionally implement a coroutine `aexecute` with the same signature; it is used
+    by `ToolBox.acall`, which otherwise runs `execute` in the event loop's default executor.
     """
 
-    def execute(self, instruction: str, context: Optional[Dict[str, Any]] = None) -> Any:
+    def execute(self, instruction: str, context: Optional[Mapping[str, Any]] = None) -> Any:
         ...
 
 
-@dataclass()
+class _Step(abc.Mapping):
+    """A recorded memory step.
+
+    Read as attributes (`step.type`, `step.content`) or as a read-only mapping with the keys
+    "type" and "content", so dict-style callers (`step["type"]`, `step.get(...)`, `dict(step)`,
+    comparison with a dict) keep working.
+    """
+
+    __slots__ = ("type", "content")
+
+    def __init__(self, step_type: str, content: Any) -> None:
+        self.type = step_type
+        self.content = content
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "type":
+            return self.type
+        if key == "content":
+            return self.content
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(("type", "content"))
+
+    def __len__(self) -> int:
+        return 2
+
+    def __repr__(self) -> str:
+        return f"_Step(type={self.type!r}, content={self.content!r})"
+
+
+class _MemoryView(abc.Sequence):
+    """Read-only sequence over the steps of a KnowledgeMemory, as handed to tools.
+
+    Supports `len()`, iteration and indexing/slicing (yielding `_Step` records), and always
+    reflects the current memory; it has no methods that modify it.
+    """
+
+    __slots__ = ("_types", "_contents")
+
+    def __init__(self, types: List[str], contents: List[Any]) -> None:
+        self._types = types
+        self._contents = contents
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __iter__(self) -> Iterator[_Step]:
+        return map(_Step, self._types, self._contents)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return list(map(_Step, self._types[index], self._contents[index]))
+        return _Step(self._types[index], self._contents[index])
+
+    def __repr__(self) -> str:
+        return f"_MemoryView({list(self)!r})"
+
+
+@dataclass(slots=True, init=False)
 class KnowledgeMemory:
     """Simple memory to store intermediate reasoning steps.
 
+    Steps are stored column-wise (one list of types, one of contents); per-step `_Step`
+    records are only built when requested through `steps`, `last` or iteration.
+
     Attributes:
-        steps: list of recorded steps (strings or structured objects)
+        steps: recorded steps (a read-only snapshot)
     """
 
-    steps: List[Dict[str, Any]] = field(default_factory=list)
+    _types: List[str]
+    _contents: List[Any]
+    _view: MappingProxyType = field(repr=False, compare=False)
+
+    def __init__(self, steps: Iterable[Mapping[str, Any]] = ()) -> None:
+        """Initialize the memory, optionally seeded with ``{"type": ..., "content": ...}`` steps."""
+        self._types = []
+        self._contents = []
+        for step in steps:
+            self._types.append(step["type"])
+            self._contents.append(step["content"])
+        self._bind_view()
+
+    def _bind_view(self) -> None:
+        self._view = MappingProxyType({"memory": _MemoryView(self._types, self._contents)})
+
+    # the view cannot be pickled or deep-copied; copies get a fresh one over their own columns
+    def __getstate__(self) -> Tuple[List[str], List[Any]]:
+        return self._types, self._contents
+
+    def __setstate__(self, state: Tuple[List[str], List[Any]]) -> None:
+        self._types, self._contents = state
+        self._bind_view()
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __iter__(self) -> Iterator[_Step]:
+        return map(_Step, self._types, self._contents)
+
+    @property
+    def steps(self) -> Tuple[_Step, ...]:
+        return tuple(self)
+
+    def view(self) -> Mapping[str, Any]:
+        """Return a read-only tool context mapping ``{"memory": <steps view>}``.
+
+        The mapping is built once and reused. The steps view is a read-only sequence that
+        tracks the memory as it grows; tools can take its `len()`, iterate or index it, but
+        cannot modify the memory through it.
+        """
+        return self._view
 
     def add_step(self, step_type: str, content: Any) -> None:
         """Add a new step to memory.
@@ -45,35 +169,180 @@ class KnowledgeMemory:
             step_type: type identifier for the step (e.g., 'query', 'tool_call', 'observation')
             content: payload (str or structured data)
         """
-        logger.debug("Adding memory step: %s", step_type)
-        self.steps.append({"type": step_type, "content": content})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Adding memory step: %s", step_type)
+        self._types.append(step_type)
+        self._contents.append(content)
 
-    def last(self, n: int = 1) -> List[Dict[str, Any]]:
+    def last(self, n: int = 1) -> List[_Step]:
         """Return last n memory entries."""
         if n <= 0:
             return []
-        return self.steps[-n:]
+        return list(map(_Step, self._types[-n:], self._contents[-n:]))
+
+
+# rows decoded per step by KGExecutor._decode
+_DECODE_BLOCK = 4096
+
+
+def _pack(*ids: int) -> int:
+    """Pack non-negative int32 term ids into a single int usable as a hash key."""
+    key = 0
+    for term_id in ids:
+        key = (key << 32) | term_id
+    return key
+
+
+def _index_add(index: Dict[int, array], key: int, row_id: int) -> None:
+    rows = index.get(key)
+    if rows is None:
+        rows = index[key] = array("i")
+    rows.append(row_id)
+
+
+def _match(s: np.ndarray, p: np.ndarray, o: np.ndarray, sp: int, pp: int, op: int) -> np.ndarray:
+    """Return indices of rows of the (s, p, o) id columns matching a pattern (-1 = wildcard)."""
+    mask = np.ones(len(s), dtype=bool)
+    if sp >= 0:
+        mask &= s == sp
+    if pp >= 0:
+        mask &= p == pp
+    if op >= 0:
+        mask &= o == op
+    return np.nonzero(mask)[0]
 
 
 class KGExecutor:
     """Lightweight executor to interact with a Knowledge Graph.
 
     This is a placeholder for actual KG access. Implementers can replace the internal storage
-    with RDFLib, a database connection, or a custom KG API.
+    with RDFLib, a database connection, or a custom KG API; such subclasses should pass a
+    `backend` other than "memory" so async callers run their blocking queries off the event loop.
+
+    The built-in store keeps terms dictionary-encoded, so terms must be hashable (unhashable
+    terms raise TypeError in `load_triples` and never match in queries). Terms are matched by
+    type and value: 1, 1.0 and True are different terms. `triples` is a read-only snapshot:
+    triples are added only through `load_triples`, and duplicates are stored once.
     """
 
-    def __init__(self) -> None:
-        # simple in-memory representation: list of triples
-        self.triples: List[Tuple[Any, Any, Any]] = []
+    __slots__ = ("backend", "_io_pool", "_io_lock", "_version", "_intern", "_terms", "_cols", "_n", "_row_of",
+                 "_by_s", "_by_p", "_by_o", "_by_sp", "_by_po", "__weakref__")
+
+    def __init__(self, backend: str = "memory") -> None:
+        """Initialize the executor.
+
+        Args:
+            backend: "memory" for the built-in store; any other value (e.g. "rdflib", "http")
+                marks `query` as blocking I/O to be offloaded by `aquery`
+        """
+        self.backend = backend
+        # dedicated pool for blocking KG I/O, so it does not compete with tool calls for the
+        # event loop's default executor; created on first use and released by close()
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._io_lock = threading.Lock()
+        # bumped whenever the stored graph changes; lets callers invalidate derived caches
+        self._version = 0
+        # simple in-memory representation: terms are dictionary-encoded to int32 ids and the
+        # graph is a single (3, capacity) int32 buffer holding the s/p/o id columns; rows
+        # [0, _n) are in use. Hash indexes keyed by each position and by the (s, p) / (p, o)
+        # pairs map to compact arrays of row ids, so most pattern shapes are answered by a
+        # single lookup instead of a scan. Triples are only materialized on output.
+        self._intern: Dict[Tuple[type, Any], int] = {}
+        self._terms: List[Any] = []
+        self._cols = np.empty((3, 0), np.int32)
+        self._n = 0
+        self._row_of: Dict[int, int] = {}
+        self._by_s: Dict[int, array] = {}
+        self._by_p: Dict[int, array] = {}
+        self._by_o: Dict[int, array] = {}
+        self._by_sp: Dict[int, array] = {}
+        self._by_po: Dict[int, array] = {}
+
+    @property
+    def triples(self) -> Tuple[Tuple[Any, Any, Any], ...]:
+        """All stored triples, as an immutable snapshot; add triples with `load_triples`."""
+        return tuple(self._query_iter((None, None, None)))
 
     def load_triples(self, triples: List[Tuple[Any, Any, Any]]) -> None:
         """Load triples into the executor.
 
+        Duplicate triples (already loaded ones included) are stored once. Terms are interned so
+        equal terms share one object, and each loaded batch is stored sorted by
+        (predicate, subject, object) so predicate-restricted scans touch contiguous rows.
+
         Args:
             triples: list of (subject, predicate, object) tuples
         """
         logger.info("Loading %d triples into KGExecutor", len(triples))
-        self.triples.extend(triples)
+        pending: Dict[int, Tuple[int, int, int]] = {}
+        for s, p, o in triples:
+            row = (self._intern_term(s), self._intern_term(p), self._intern_term(o))
+            key = _pack(*row)
+            if key not in self._row_of:
+                pending[key] = row
+        if not pending:
+            return
+        batch = np.array(list(pending.values()), dtype=np.int32).T
+        batch = batch[:, np.lexsort((batch[2], batch[0], batch[1]))]
+        start, stop = self._n, self._n + len(pending)
+        if stop > self._cols.shape[1]:
+            # grow by doubling so repeated small loads stay amortized O(1) per triple
+            grown = np.empty((3, max(stop, 2 * self._cols.shape[1])), np.int32)
+            grown[:, :start] = self._cols[:, :start]
+            self._cols = grown
+        self._cols[:, start:stop] = batch
+        self._n = stop
+        self._version += 1
+        for row_id, (s, p, o) in enumerate(zip(*batch.tolist()), start):
+            self._row_of[_pack(s, p, o)] = row_id
+            _index_add(self._by_s, s, row_id)
+            _index_add(self._by_p, p, row_id)
+            _index_add(self._by_o, o, row_id)
+            _index_add(self._by_sp, _pack(s, p), row_id)
+            _index_add(self._by_po, _pack(p, o), row_id)
+
+    def _intern_term(self, term: Any) -> int:
+        """Return the integer id of a term, assigning a new one if needed.
+
+        Terms are keyed by (type, value), so equal values of different types such as 1, 1.0
+        and True stay distinct terms. The first occurrence of a term becomes its canonical
+        object (strings are additionally passed through `sys.intern`), so decoded triples share
+        term objects.
+        """
+        key = (type(term), term)
+        term_id = self._intern.get(key)
+        if term_id is None:
+            if type(term) is str:
+                term = sys.intern(term)
+            term_id = self._intern[key] = len(self._terms)
+            self._terms.append(term)
+        return term_id
+
+    def _lookup(self, pattern: Tuple[Optional[Any], Optional[Any], Optional[Any]]) -> Sequence[int]:
+        """Return the row ids matching a pattern without copying.
+
+        The pattern's shape (which positions are bound) selects a lookup specialized for it
+        from `_LOOKUPS`, so the cost is proportional to the number of results rather than to
+        the size of the KG. Index arrays are returned as-is and must not be mutated by callers.
+        """
+        s, p, o = pattern
+        return _LOOKUPS[s is not None, p is not None, o is not None](self, s, p, o)
+
+    def _decode(self, row_ids: Sequence[int]) -> Iterator[Tuple[Any, Any, Any]]:
+        """Lazily turn row ids into (s, p, o) term tuples, a block of rows at a time."""
+        terms = self._terms
+        for start in range(0, len(row_ids), _DECODE_BLOCK):
+            block = row_ids[start:start + _DECODE_BLOCK]
+            if isinstance(block, range):
+                cols = self._cols[:, block.start:block.stop]
+            else:
+                cols = self._cols[:, np.asarray(block, dtype=np.intp)]
+            for s, p, o in zip(*cols.tolist()):
+                yield terms[s], terms[p], terms[o]
+
+    def _query_iter(self, pattern: Tuple[Optional[Any], Optional[Any], Optional[Any]]) -> Iterator[Tuple[Any, Any, Any]]:
+        """Lazily yield triples matching a pattern."""
+        return self._decode(self._lookup(pattern))
 
     def query(self, pattern: Tuple[Optional[Any], Optional[Any], Optional[Any]]) -> List[Tuple[Any, Any, Any]]:
         """Query triples by pattern where elements can be None as wildcard.
@@ -84,14 +353,68 @@ class KGExecutor:
         Returns:
             Matching triples list
         """
-        s_pat, p_pat, o_pat = pattern
-        results = [t for t in self.triples if
-                   (s_pat is None or t[0] == s_pat) and
-                   (p_pat is None or t[1] == p_pat) and
-                   (o_pat is None or t[2] == o_pat)]
-        logger.debug("Query %s -> %d results", pattern, len(results))
+        results = list(self._query_iter(pattern))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Query %s -> %d results", pattern, len(results))
         return results
 
+    def query_many(self, patterns: Sequence[Tuple[Optional[Any], Optional[Any], Optional[Any]]]) -> List[List[Tuple[Any, Any, Any]]]:
+        """Answer several patterns at once.
+
+        Each pattern is resolved through the indexes, then the row ids of all patterns are
+        decoded with a single gather over the id columns.
+
+        Returns:
+            One list of matching triples per pattern, in pattern order
+        """
+        matches = [np.asarray(self._lookup(pattern), dtype=np.intp) for pattern in patterns]
+        if not matches:
+            return []
+        terms = self._terms
+        s, p, o = self._cols[:, np.concatenate(matches)].tolist()
+        decoded = [(terms[a], terms[b], terms[c]) for a, b, c in zip(s, p, o)]
+        results = []
+        start = 0
+        for rows in matches:
+            results.append(decoded[start:start + len(rows)])
+            start += len(rows)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Batch query of %d patterns -> %d results", len(patterns), len(decoded))
+        return results
+
+    async def aquery(self, pattern: Tuple[Optional[Any], Optional[Any], Optional[Any]]) -> List[Tuple[Any, Any, Any]]:
+        """Async counterpart of `query`.
+
+        In-memory lookups run directly; other backends run `query` on the KG I/O thread pool
+        so that concurrent queries overlap their latency instead of blocking the event loop.
+        """
+        if self.backend == "memory":
+            return self.query(pattern)
+        return await self.run_io(self.query, pattern)
+
+    async def run_io(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call, such as a query against a remote backend, on the KG I/O pool."""
+        with self._io_lock:
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(thread_name_prefix="kg-io")
+            pool = self._io_pool
+        return await asyncio.get_running_loop().run_in_executor(pool, functools.partial(fn, *args))
+
+    def close(self) -> None:
+        """Shut down the KG I/O pool, if one was started; it is recreated on next use."""
+        with self._io_lock:
+            pool, self._io_pool = self._io_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def exists(self, pattern: Tuple[Optional[Any], Optional[Any], Optional[Any]]) -> bool:
+        """Return whether any triple matches the pattern, without building a result list."""
+        return len(self._lookup(pattern)) > 0
+
+    def count(self, pattern: Tuple[Optional[Any], Optional[Any], Optional[Any]]) -> int:
+        """Return the number of triples matching the pattern, without building a result list."""
+        return len(self._lookup(pattern))
+
     def execute_program(self, program: str) -> Any:
         """Execute a small program (string) over the KG.
 
@@ -104,30 +427,145 @@ class KGExecutor:
         return {"result": None, "note": "execute_program is a placeholder"}
 
 
+# Pattern lookups specialized per shape (s bound, p bound, o bound). Each one resolves only
+# the bound terms to ids and reads a single index; an unknown term means no match.
+
+def _term_id(kg: KGExecutor, term: Any) -> int:
+    """Return the id of a stored term, or -1 if it is unknown (or unhashable, so never stored)."""
+    try:
+        return kg._intern.get((type(term), term), -1)
+    except TypeError:
+        return -1
+
+
+def _lookup_spo(kg: KGExecutor, s: Any, p: Any, o: Any) -> Sequence[int]:
+    s_id, p_id, o_id = _term_id(kg, s), _term_id(kg, p), _term_id(kg, o)
+    if s_id < 0 or p_id < 0 or o_id < 0:
+        return ()
+    row_id = kg._row_of.get(_pack(s_id, p_id, o_id))
+    return () if row_id is None else (row_id,)
+
+
+def _lookup_sp(kg: KGExecutor, s: Any, p: Any, o: Any) -> Sequence[int]:
+    s_id, p_id = _term_id(kg, s), _term_id(kg, p)
+    if s_id < 0 or p_id < 0:
+        return ()
+    return kg._by_sp.get(_pack(s_id, p_id), ())
+
+
+def _lookup_po(kg: KGExecutor, s: Any, p: Any, o: Any) -> Sequence[int]:
+    p_id, o_id = _term_id(kg, p), _term_id(kg, o)
+    if p_id < 0 or o_id < 0:
+        return ()
+    return kg._by_po.get(_pack(p_id, o_id), ())
+
+
+def _lookup_so(kg: KGExecutor, s: Any, p: Any, o: Any) -> Sequence[int]:
+    # no composite index for this rare shape: use the vectorized kernel over the id columns
+    s_id, o_id = _term_id(kg, s), _term_id(kg, o)
+    if s_id < 0 or o_id < 0:
+        return ()
+    cols = kg._cols[:, :kg._n]
+    return _match(cols[0], cols[1], cols[2], s_id, -1, o_id)
+
+
+def _lookup_s(kg: KGExecutor, s: Any, p: Any, o: Any) -> Sequence[int]:
+    return kg._by_s.get(_term_id(kg, s), ())
+
+
+def _lookup_p(kg: KGExecutor, s: Any, p: Any, o: Any) -> Sequence[int]:
+    return kg._by_p.get(_term_id(kg, p), ())
+
+
+def _lookup_o(kg: KGExecutor, s: Any, p: Any, o: Any) -> Sequence[int]:
+    return kg._by_o.get(_term_id(kg, o), ())
+
+
+def _lookup_all(kg: KGExecutor, s: Any, p: Any, o: Any) -> Sequence[int]:
+    return range(kg._n)
+
+
+_LOOKUPS: Dict[Tuple[bool, bool, bool], Callable[[KGExecutor, Any, Any, Any], Sequence[int]]] = {
+    (True, True, True): _lookup_spo,
+    (True, True, False): _lookup_sp,
+    (False, True, True): _lookup_po,
+    (True, False, True): _lookup_so,
+    (True, False, False): _lookup_s,
+    (False, True, False): _lookup_p,
+    (False, False, True): _lookup_o,
+    (False, False, False): _lookup_all,
+}
+
+
 class ToolBox:
     """Registry and dispatcher for tools the agent can call.
 
     Tools are simply callables/objects that implement the Tool protocol.
     """
 
+    __slots__ = ("_tools", "_execs", "_aexecs", "_version", "__weakref__")
+
     def __init__(self) -> None:
         self._tools: Dict[str, Tool] = {}
+        # tool.execute bound once at registration, so call() does one lookup and a direct call
+        self._execs: Dict[str, Callable[..., Any]] = {}
+        # bound tool.aexecute, or None for sync-only tools
+        self._aexecs: Dict[str, Optional[Callable[..., Any]]] = {}
+        # bumped on every registration; lets callers invalidate derived caches
+        self._version = 0
 
     def register(self, name: str, tool: Tool) -> None:
         """Register a tool under a name."""
         logger.info("Registering tool: %s", name)
         self._tools[name] = tool
+        self._execs[name] = tool.execute
+        self._aexecs[name] = getattr(tool, "aexecute", None)
+        self._version += 1
 
-    def call(self, name: str, instruction: str, context: Optional[Dict[str, Any]] = None) -> Any:
+    def __contains__(self, name: object) -> bool:
+        return name in self._execs
+
+    def call(self, name: str, instruction: str, context: Optional[Mapping[str, Any]] = None) -> Any:
         """Call a tool by name.
 
         Raises:
             KeyError: if tool not found
         """
-        if name not in self._tools:
+        fn = self._execs.get(name)
+        if fn is None:
+            raise KeyError(f"Tool {name} not found in toolbox")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Calling tool %s with instruction: %s", name, instruction)
+        return fn(instruction, context=context)
+
+    async def acall(self, name: str, instruction: str, context: Optional[Mapping[str, Any]] = None) -> Any:
+        """Async counterpart of `call`.
+
+        Awaits the tool's `aexecute` if it has one; sync-only tools are run in the default
+        executor so they do not block the event loop.
+
+        Raises:
+            KeyError: if tool not found
+        """
+        fn = self._execs.get(name)
+        if fn is None:
             raise KeyError(f"Tool {name} not found in toolbox")
-        logger.debug("Calling tool %s with instruction: %s", name, instruction)
-        return self._tools[name].execute(instruction, context=context)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Calling tool %s asynchronously with instruction: %s", name, instruction)
+        afn = self._aexecs[name]
+        if afn is not None:
+            return await afn(instruction, context=context)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(fn, instruction, context=context))
+
+
+def _flush_trace(trace: Deque[Tuple[float, str, Any]], start: float, step: int) -> None:
+    """Emit the trace of an agent run that started at `start` as a single log record."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    events = [(round(t - start, 6), event, value) for t, event, value in trace]
+    logger.info("Agent run ended after %d steps in %.3fs; trace: %s",
+                step, time.monotonic() - start, events)
 
 
 class Agent:
@@ -137,27 +575,61 @@ class Agent:
     LLM integration and tool selection logic should be implemented by the user.
     """
 
-    def __init__(self, llm: Any = None, toolbox: Optional[ToolBox] = None, kg_executor: Optional[KGExecutor] = None) -> None:
+    __slots__ = ("llm", "toolbox", "kg", "memory", "max_steps", "per_step_decision", "_pool", "embed_fn",
+                 "_exact_cache", "_emb_cache", "_cache_stamp", "__weakref__")
+
+    # default for `per_step_decision`; set to True in subclasses whose decision depends on the
+    # memory accumulated during the run
+    PER_STEP_DECISION: bool = False
+
+    def __init__(self, llm: Any = None, toolbox: Optional[ToolBox] = None, kg_executor: Optional[KGExecutor] = None,
+                 embed_fn: Optional[Callable[[str], Any]] = None) -> None:
         """Initialize the Agent.
 
         Args:
             llm: language model interface (could be a HuggingFace pipeline or custom wrapper)
             toolbox: ToolBox instance
             kg_executor: KGExecutor instance
+            embed_fn: optional text -> vector function; enables reuse of cached results for
+                paraphrased queries (cosine similarity >= SIMILARITY_THRESHOLD)
         """
         self.llm = llm
         self.toolbox = toolbox or ToolBox()
         self.kg = kg_executor or KGExecutor()
         self.memory = KnowledgeMemory()
         self.max_steps = 10
-
-    def decide_tool(self, prompt: str) -> str:
+        # decide_tool is consulted once per run unless this is set
+        self.per_step_decision = self.PER_STEP_DECISION
+        # pool used when decide_tool proposes several independent tool calls in one step;
+        # created on first use and released by close()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # final results of previous runs, keyed by normalized query (LRU order)
+        self.embed_fn = embed_fn
+        self._exact_cache: OrderedDict[str, Any] = OrderedDict()
+        self._emb_cache: OrderedDict[str, Tuple[np.ndarray, Any]] = OrderedDict()
+        # (kg version, toolbox version) the cached results were computed against
+        self._cache_stamp: Tuple[int, int] = (self.kg._version, self.toolbox._version)
+
+    def close(self) -> None:
+        """Shut down the thread pools started for tool batches and for KG I/O, if any."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self.kg.close()
+
+    def decide_tool(self, prompt: str) -> Union[str, List[Tuple[str, str]], None]:
         """Decide which tool to call based on prompt and memory.
 
         This is a placeholder decision function. In practice, it uses the LLM to select the tool
         and generate the instruction/program to run.
+
+        Returns:
+            Either a single tool name (the agent builds the instruction), or a list of
+            (tool_name, instruction) pairs to be executed concurrently within one step.
+            None, an empty list or an unregistered tool name stops the run.
         """
-        logger.debug("Deciding tool for prompt: %s", prompt)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Deciding tool for prompt: %s", prompt)
         # TODO: Integrate LLM to make tool selection and program generation
         # For demonstration return a default tool name if exists
         available = list(self.toolbox._tools.keys())
@@ -169,52 +641,350 @@ class Agent:
         Args:
             query: user question to be answered
 
+        Results are cached per agent (see `_cache_lookup`): a repeated or, with `embed_fn`,
+        paraphrased query returns a copy of the earlier result without running the loop; memory
+        then records the query followed by a 'cached_result' step. The cache is cleared when the
+        agent's KG or toolbox changes.
+
         Returns:
             Final answer object (placeholder)
         """
-        logger.info("Agent started for query: %s", query)
-        self.memory.add_step("query", query)
+        key, emb, hit, cached = self._cache_lookup(query)
+        if hit:
+            return self._replay(query, cached)
+        trace, started = self._begin(query)
+        # hoist loop invariants: the context view is a stable object and bound methods are
+        # resolved once per run rather than once per step
+        context = self.memory.view()
+        plan = self._plan
+        execute_action = self._execute_action
+        execute_batch = self._execute_batch
+        record = self._record
+        max_steps = self.max_steps
         step = 0
         result = None
-        while step < self.max_steps:
-            logger.info("Agent step %d", step)
-            tool_name = self.decide_tool(query)
-            instruction = f"Perform operation for: {query} (step {step})"
-            # If LLM was available, instruction would be generated by it
-            try:
-                out = self.toolbox.call(tool_name, instruction, context={"memory": self.memory.steps})
-            except KeyError:
-                logger.warning("Tool %s not found, stopping.", tool_name)
-                break
-            self.memory.add_step("tool_call", {"tool": tool_name, "out": out})
+        decision = None
+        try:
+            while step < max_steps:
+                decision = plan(query, step, decision, trace)
+                if decision is None:
+                    break
+                if isinstance(decision, str):
+                    instruction = f"Perform operation for: {query} (step {step})"
+                    # If LLM was available, instruction would be generated by it
+                    entries = execute_action(decision, instruction, context=context)
+                else:
+                    entries = execute_batch(decision, context=context)
+                result = record(entries)
+                if result is not None:
+                    trace.append((time.monotonic(), "final", step))
+                    break
+                step += 1
+        finally:
+            _flush_trace(trace, started, step)
+        self._cache_store(key, emb, result)
+        return result
+
+    async def arun(self, query: str) -> Any:
+        """Async counterpart of `run` for asyncio hosts.
+
+        Tools are awaited through `ToolBox.acall` and batches proposed by `decide_tool` are
+        gathered on the event loop instead of the thread pool. Result caching behaves as in `run`;
+        `embed_fn` runs in the loop's default executor.
+
+        Args:
+            query: user question to be answered
+
+        Returns:
+            Final answer object (placeholder)
+        """
+        key, hit, cached = self._cache_exact(query)
+        emb = None
+        if not hit and self.embed_fn is not None:
+            # embedding models are usually blocking; keep them off the event loop
+            emb = await asyncio.get_running_loop().run_in_executor(None, self._embed, key)
+            hit, cached = self._cache_similar(key, emb)
+        if hit:
+            return self._replay(query, cached)
+        trace, started = self._begin(query)
+        # loop invariants, hoisted as in run
+        context = self.memory.view()
+        plan = self._plan
+        execute_action = self._aexecute_action
+        execute_batch = self._aexecute_batch
+        record = self._record
+        max_steps = self.max_steps
+        step = 0
+        result = None
+        decision = None
+        try:
+            while step < max_steps:
+                decision = plan(query, step, decision, trace)
+                if decision is None:
+                    break
+                if isinstance(decision, str):
+                    instruction = f"Perform operation for: {query} (step {step})"
+                    entries = await execute_action(decision, instruction, context=context)
+                else:
+                    entries = await execute_batch(decision, context=context)
+                result = record(entries)
+                if result is not None:
+                    trace.append((time.monotonic(), "final", step))
+                    break
+                step += 1
+        finally:
+            _flush_trace(trace, started, step)
+        self._cache_store(key, emb, result)
+        return result
+
+    def _replay(self, query: str, cached: Any) -> Any:
+        """Record a cache hit in memory and return the cached result."""
+        self.memory.add_step("query", query)
+        self.memory.add_step("cached_result", cached)
+        return cached
+
+    def _begin(self, query: str) -> Tuple[Deque[Tuple[float, str, Any]], float]:
+        """Open the trace of a run and record the query in memory.
+
+        The trace holds (monotonic time, event, value) records and is logged once when the run
+        ends; it is kept per run so concurrent arun calls on one agent do not interleave.
+        """
+        started = time.monotonic()
+        trace: Deque[Tuple[float, str, Any]] = deque(maxlen=TRACE_SIZE)
+        trace.append((started, "start", query))
+        self.memory.add_step("query", query)
+        return trace, started
+
+    def _plan(self, query: str, step: int, decision: Any, trace: Deque[Tuple[float, str, Any]]) -> Any:
+        """Return the decision for `step`, or None to stop the run.
+
+        `decide_tool` is consulted on the first step only, unless `per_step_decision` is set;
+        later steps reuse the previous decision.
+        """
+        trace.append((time.monotonic(), "step", step))
+        if step and not self.per_step_decision:
+            return decision
+        decision = self.decide_tool(query)
+        if not decision:
+            logger.warning("No tool proposed, stopping.")
+            return None
+        if isinstance(decision, str) and decision not in self.toolbox:
+            logger.warning("Tool %s not found, stopping.", decision)
+            return None
+        return decision
+
+    def _cache_lookup(self, query: str) -> Tuple[str, Optional[np.ndarray], bool, Any]:
+        """Look up a previous result for `query` in both tiers.
+
+        Hits return a deep copy, so callers cannot alter the cached value.
+
+        Returns:
+            (normalized key, query embedding or None, hit flag, cached result)
+        """
+        key, hit, cached = self._cache_exact(query)
+        if hit or self.embed_fn is None:
+            return key, None, hit, cached
+        emb = self._embed(key)
+        hit, cached = self._cache_similar(key, emb)
+        return key, emb, hit, cached
+
+    def _cache_exact(self, query: str) -> Tuple[str, bool, Any]:
+        """Normalize `query` and look it up in the exact tier.
+
+        Both tiers are dropped first if the KG or the toolbox changed since results were cached.
+
+        Returns:
+            (normalized key, hit flag, cached result)
+        """
+        stamp = (self.kg._version, self.toolbox._version)
+        if stamp != self._cache_stamp:
+            self._exact_cache.clear()
+            self._emb_cache.clear()
+            self._cache_stamp = stamp
+        key = " ".join(query.lower().split())
+        if key in self._exact_cache:
+            self._exact_cache.move_to_end(key)
+            logger.debug("Result cache hit for query: %s", key)
+            return key, True, copy.deepcopy(self._exact_cache[key])
+        return key, False, None
+
+    def _embed(self, key: str) -> np.ndarray:
+        """Return the unit-length embedding of a normalized query."""
+        emb = np.asarray(self.embed_fn(key), dtype=np.float32)
+        return emb / (np.linalg.norm(emb) or 1.0)
+
+    def _cache_similar(self, key: str, emb: np.ndarray) -> Tuple[bool, Any]:
+        """Look up the cached result whose query embedding is closest to `emb`.
+
+        Returns:
+            (hit flag, cached result); a hit needs cosine similarity >= SIMILARITY_THRESHOLD
+        """
+        if self._emb_cache:
+            keys = list(self._emb_cache)
+            sims = np.stack([self._emb_cache[k][0] for k in keys]) @ emb
+            best = int(np.argmax(sims))
+            if sims[best] >= SIMILARITY_THRESHOLD:
+                self._emb_cache.move_to_end(keys[best])
+                logger.debug("Result cache hit for query %s (similar to %s)", key, keys[best])
+                return True, copy.deepcopy(self._emb_cache[keys[best]][1])
+        return False, None
+
+    def _cache_store(self, key: str, emb: Optional[np.ndarray], result: Any) -> None:
+        """Remember a copy of a final result; runs that end without one are not cached."""
+        if result is None:
+            return
+        result = copy.deepcopy(result)
+        self._exact_cache[key] = result
+        if len(self._exact_cache) > RESULT_CACHE_SIZE:
+            self._exact_cache.popitem(last=False)
+        if emb is not None:
+            self._emb_cache[key] = (emb, result)
+            if len(self._emb_cache) > RESULT_CACHE_SIZE:
+                self._emb_cache.popitem(last=False)
+
+    def _record(self, entries: List[Tuple[str, Any]]) -> Any:
+        """Add entries to memory and return the first final tool output among them, if any."""
+        result = None
+        for step_type, content in entries:
+            self.memory.add_step(step_type, content)
             # Simple termination condition: if tool returned a final answer
-            if isinstance(out, dict) and out.get("final", False):
+            out = content.get("out") if step_type == "tool_call" else None
+            if result is None and isinstance(out, dict) and out.get("final", False):
                 result = out
-                logger.info("Agent obtained final result at step %d", step)
-                break
-            step += 1
-        logger.info("Agent finished after %d steps", step)
         return result
 
+    def _execute_action(self, tool_name: str, instruction: str, context: Optional[Mapping[str, Any]] = None) -> List[Tuple[str, Any]]:
+        """Call a single tool and return the memory entries it produced.
+
+        Memory is not touched here so that actions can run on worker threads; the caller
+        records the returned (step_type, content) entries.
+        """
+        out = self.toolbox.call(tool_name, instruction, context=context)
+        return [("tool_call", {"tool": tool_name, "out": out})]
+
+    def _execute_batch(self, actions: List[Tuple[str, str]], context: Optional[Mapping[str, Any]] = None) -> List[Tuple[str, Any]]:
+        """Run several (tool_name, instruction) actions concurrently on the agent's pool.
+
+        Entries are returned in action order, as in `_aexecute_batch`. A failing action yields
+        an 'error' entry instead of aborting the rest of the batch.
+        """
+        if not actions:
+            return []
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=int(os.getenv("TOOL_CONCURRENCY_LIMIT", "1")))
+        futures = [
+            self._pool.submit(self._execute_action, tool_name, instruction, context)
+            for tool_name, instruction in actions
+        ]
+        entries: List[Tuple[str, Any]] = []
+        for (tool_name, _), future in zip(actions, futures):
+            try:
+                entries.extend(future.result())
+            except Exception as exc:
+                logger.warning("Tool %s failed: %r", tool_name, exc)
+                entries.append(("error", {"tool": tool_name, "error": repr(exc)}))
+        return entries
+
+    async def _aexecute_action(self, tool_name: str, instruction: str, context: Optional[Mapping[str, Any]] = None) -> List[Tuple[str, Any]]:
+        """Async counterpart of `_execute_action`."""
+        out = await self.toolbox.acall(tool_name, instruction, context=context)
+        return [("tool_call", {"tool": tool_name, "out": out})]
+
+    async def _aexecute_batch(self, actions: List[Tuple[str, str]], context: Optional[Mapping[str, Any]] = None) -> List[Tuple[str, Any]]:
+        """Async counterpart of `_execute_batch`; entries are returned in action order."""
+        if not actions:
+            return []
+        outcomes = await asyncio.gather(
+            *(self._aexecute_action(tool_name, instruction, context) for tool_name, instruction in actions),
+            return_exceptions=True,
+        )
+        entries: List[Tuple[str, Any]] = []
+        for (tool_name, _), outcome in zip(actions, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning("Tool %s failed: %r", tool_name, outcome)
+                entries.append(("error", {"tool": tool_name, "error": repr(outcome)}))
+            else:
+                entries.extend(outcome)
+        return entries
+
 
 # Example concrete tool implementations (lightweight)
 
+_PATTERN_RE = re.compile(r"^\s*\(([^,()]*),([^,()]*),([^,()]*)\)\s*$")
+_WILDCARDS = ("", "?", "*")
+
+
+def _parse_pattern(text: str) -> Optional[Tuple[Optional[str], Optional[str], Optional[str]]]:
+    """Parse "(s, p, o)" into a triple pattern; '?', '*' or an empty slot is a wildcard.
+
+    Returns None if `text` is not a pattern.
+    """
+    m = _PATTERN_RE.match(text)
+    if m is None:
+        return None
+    s, p, o = (None if part.strip() in _WILDCARDS else part.strip() for part in m.groups())
+    return s, p, o
+
+
+def _as_pattern(item: Any) -> Optional[Tuple[Any, Any, Any]]:
+    """Return a non-string batch item as an (s, p, o) pattern, or None if it is not one."""
+    try:
+        pattern = tuple(item)
+    except TypeError:
+        return None
+    return pattern if len(pattern) == 3 else None
+
+
 class KGQueryTool:
-    """Tool that queries the KGExecutor with a simple pattern string.
+    """Tool that queries the KGExecutor with triple patterns.
+
+    The `instruction` is one of:
+    - a single-line "(s, p, o)" pattern ('?' marks a wildcard): `results` is the flat list of
+      matching triples;
+    - a newline-separated block, or a list, of patterns (list items may also be (s, p, o)
+      tuples): the batch is answered with one `KGExecutor.query_many` call and `results` holds
+      one list of triples per pattern, with the parsed patterns under `patterns`;
+    - free-form text with no pattern: all triples are returned (placeholder behaviour).
 
-    The `instruction` is expected to be a string that contains an s,p,o triple or a
-    small query language. This is a placeholder to be replaced by a robust tool.
+    This is a placeholder to be replaced by a robust tool.
     """
 
+    __slots__ = ("kg",)
+
     def __init__(self, kg_executor: KGExecutor) -> None:
         self.kg = kg_executor
 
-    def execute(self, instruction: str, context: Optional[Dict[str, Any]] = None) -> Any:
-        logger.debug("KGQueryTool received instruction: %s", instruction)
-        # TODO: parse instruction into triple pattern; here we return all triples
-        results = self.kg.query((None, None, None))
+    def execute(self, instruction: Union[str, Sequence[Any]], context: Optional[Mapping[str, Any]] = None) -> Any:
+        """Run the pattern(s) in `instruction` against the KG.
+
+        Raises:
+            ValueError: if a batch contains an item that is not a valid pattern
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("KGQueryTool received instruction: %s", instruction)
         # Example of a returning structure; `final` indicates completion
-        return {"results": results, "final": False}
+        if isinstance(instruction, str):
+            lines = [line for line in instruction.splitlines() if line.strip()]
+            patterns = [_parse_pattern(line) for line in lines]
+            if all(pattern is None for pattern in patterns):
+                # TODO: parse free-form instructions (or programs) into triple patterns
+                return {"results": self.kg.query((None, None, None)), "final": False}
+            if len(lines) == 1:
+                return {"results": self.kg.query(patterns[0]), "final": False}
+            items: Sequence[Any] = lines
+        else:
+            items = instruction
+            patterns = [_parse_pattern(item) if isinstance(item, str) else _as_pattern(item) for item in items]
+        for item, pattern in zip(items, patterns):
+            if pattern is None:
+                raise ValueError(f"Invalid triple pattern in batch: {item!r}")
+        return {"results": self.kg.query_many(patterns), "patterns": patterns, "final": False}
+
+    async def aexecute(self, instruction: Union[str, Sequence[Any]], context: Optional[Mapping[str, Any]] = None) -> Any:
+        if self.kg.backend == "memory":
+            # in-memory lookups are cheap enough to run directly on the event loop
+            return self.execute(instruction, context=context)
+        return await self.kg.run_io(self.execute, instruction, context)
 
 
 class FinalAnswerTool:
@@ -223,12 +993,18 @@ class FinalAnswerTool:
     In practice: uses LLM to synthesize an answer from memory records.
     """
 
+    __slots__ = ("llm",)
+
     def __init__(self, llm: Any = None) -> None:
         self.llm = llm
 
-    def execute(self, instruction: str, context: Optional[Dict[str, Any]] = None) -> Any:
+    def execute(self, instruction: str, context: Optional[Mapping[str, Any]] = None) -> Any:
         logger.debug("FinalAnswerTool generating answer from memory")
         memory = (context or {}).get("memory", [])
         # TODO: call LLM to synthesize final answer from memory
         synthesized = f"SYNTHESIZED_ANSWER based on {len(memory)} steps"
         return {"answer": synthesized, "final": True}
+
+    async def aexecute(self, instruction: str, context: Optional[Mapping[str, Any]] = None) -> Any:
+        # TODO: await an async LLM client here once LLM synthesis is implemented
+        return self.execute(instruction, context=context)
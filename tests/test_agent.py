@@ -0,0 +1,191 @@
+"""Tests for KGQueryTool instruction parsing and the Agent run loop."""
+
+import asyncio
+import os
+import time
+import unittest
+from unittest import mock
+
+from kg_agent import Agent, FinalAnswerTool, KGExecutor, KGQueryTool, ToolBox
+from kg_agent import core
+
+_TRIPLES = [
+    ("alice", "works_at", "acme"),
+    ("bob", "works_at", "acme"),
+    ("acme", "located_in", "paris"),
+]
+
+
+class KGQueryToolTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.kg = KGExecutor()
+        self.kg.load_triples(_TRIPLES)
+        self.tool = KGQueryTool(self.kg)
+
+    def test_single_line_returns_flat_results(self) -> None:
+        out = self.tool.execute("(alice, works_at, ?)")
+        self.assertEqual(out, {"results": [("alice", "works_at", "acme")], "final": False})
+
+    def test_wildcards(self) -> None:
+        for slot in ("?", "*", "", " "):
+            with self.subTest(slot=slot):
+                out = self.tool.execute(f"({slot}, works_at, acme)")
+                self.assertEqual(sorted(out["results"]), sorted(_TRIPLES[:2]))
+
+    def test_multi_line_batch_returns_one_list_per_pattern(self) -> None:
+        out = self.tool.execute("(alice, works_at, ?)\n\n(acme, ?, ?)\n(nobody, ?, ?)")
+        self.assertEqual(out["patterns"], [("alice", "works_at", None), ("acme", None, None), ("nobody", None, None)])
+        self.assertEqual(out["results"], [[_TRIPLES[0]], [_TRIPLES[2]], []])
+        self.assertFalse(out["final"])
+
+    def test_list_batch_accepts_strings_and_tuples(self) -> None:
+        out = self.tool.execute(["(alice, works_at, ?)", (None, "located_in", "paris")])
+        self.assertEqual(out["patterns"], [("alice", "works_at", None), (None, "located_in", "paris")])
+        self.assertEqual(out["results"], [[_TRIPLES[0]], [_TRIPLES[2]]])
+
+    def test_free_text_returns_everything(self) -> None:
+        out = self.tool.execute("Who works at ACME?")
+        self.assertEqual(sorted(out["results"]), sorted(_TRIPLES))
+        self.assertNotIn("patterns", out)
+
+    def test_mixed_or_invalid_batches_raise(self) -> None:
+        for instruction in ("(alice, works_at, ?)\nwho else?", ["(alice, works_at, ?)", "(a, b)"],
+                            [("alice", "works_at")], [42]):
+            with self.subTest(instruction=instruction):
+                with self.assertRaises(ValueError):
+                    self.tool.execute(instruction)
+
+    def test_aexecute_matches_execute(self) -> None:
+        instruction = "(alice, works_at, ?)\n(acme, ?, ?)"
+        self.assertEqual(asyncio.run(self.tool.aexecute(instruction)), self.tool.execute(instruction))
+
+
+class _ScriptedAgent(Agent):
+    """Agent whose decide_tool returns a fixed decision."""
+
+    __slots__ = ("decision", "decisions")
+
+    def __init__(self, decision, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.decision = decision
+        self.decisions = 0
+
+    def decide_tool(self, prompt):
+        self.decisions += 1
+        return self.decision
+
+
+class _SleepyTool:
+    """Returns its instruction after a delay, to let batch calls finish out of order."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def execute(self, instruction, context=None):
+        time.sleep(self.delay)
+        return {"echo": instruction, "final": False}
+
+    async def aexecute(self, instruction, context=None):
+        await asyncio.sleep(self.delay)
+        return {"echo": instruction, "final": False}
+
+
+class _FailingTool:
+
+    def execute(self, instruction, context=None):
+        raise RuntimeError("boom")
+
+
+class AgentLoopTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.kg = KGExecutor()
+        self.kg.load_triples(_TRIPLES)
+        self.toolbox = ToolBox()
+        self.toolbox.register("kg_query", KGQueryTool(self.kg))
+        self.toolbox.register("final_answer", FinalAnswerTool())
+        self.toolbox.register("slow", _SleepyTool(0.05))
+        self.toolbox.register("fast", _SleepyTool(0.0))
+        self.toolbox.register("failing", _FailingTool())
+
+    def _agent(self, decision) -> _ScriptedAgent:
+        agent = _ScriptedAgent(decision, toolbox=self.toolbox, kg_executor=self.kg)
+        self.addCleanup(agent.close)
+        return agent
+
+    def test_final_tool_ends_the_run(self) -> None:
+        agent = self._agent("final_answer")
+        result = agent.run("Where does Alice work?")
+        self.assertEqual(result, {"answer": "SYNTHESIZED_ANSWER based on 1 steps", "final": True})
+        self.assertEqual([step.type for step in agent.memory], ["query", "tool_call"])
+
+    def test_decision_is_reused_unless_per_step(self) -> None:
+        agent = self._agent("kg_query")
+        agent.max_steps = 3
+        self.assertIsNone(agent.run("q"))
+        self.assertEqual(agent.decisions, 1)
+        agent = self._agent("kg_query")
+        agent.max_steps = 3
+        agent.per_step_decision = True
+        agent.run("q")
+        self.assertEqual(agent.decisions, 3)
+
+    def test_batch_entries_follow_action_order(self) -> None:
+        actions = [("slow", "first"), ("failing", "second"), ("missing", "third"), ("fast", "fourth")]
+        with mock.patch.dict(os.environ, {"TOOL_CONCURRENCY_LIMIT": "4"}):
+            agent = self._agent(actions)
+            agent.max_steps = 1
+            with self.assertLogs(core.logger, "WARNING"):
+                agent.run("q")
+        entries = agent.memory.steps[1:]
+        self.assertEqual([(step.type, step.content["tool"]) for step in entries],
+                         [("tool_call", "slow"), ("error", "failing"), ("error", "missing"), ("tool_call", "fast")])
+        self.assertEqual(entries[0].content["out"]["echo"], "first")
+        self.assertIn("boom", entries[1].content["error"])
+
+    def test_arun_matches_run(self) -> None:
+        actions = [("slow", "first"), ("failing", "second"), ("fast", "third")]
+        for decision in ("final_answer", "kg_query", actions):
+            with self.subTest(decision=decision):
+                sync_agent, async_agent = self._agent(decision), self._agent(decision)
+                sync_agent.max_steps = async_agent.max_steps = 2
+                with self.assertLogs(core.logger, "INFO"):
+                    expected = sync_agent.run("q")
+                    actual = asyncio.run(async_agent.arun("q"))
+                self.assertEqual(actual, expected)
+                self.assertEqual(async_agent.memory, sync_agent.memory)
+
+    def test_stops_when_no_tool_is_proposed(self) -> None:
+        for decision in (None, [], "unknown"):
+            with self.subTest(decision=decision):
+                agent = self._agent(decision)
+                with self.assertLogs(core.logger, "WARNING") as logs:
+                    self.assertIsNone(agent.run("q"))
+                self.assertEqual(agent.decisions, 1)
+                self.assertEqual(len(agent.memory), 1)
+                self.assertIsNone(agent._pool)
+                self.assertEqual(len(logs.records), 1)
+                self.assertNotIn("None", logs.records[0].getMessage())
+
+    def test_memory_steps_compare_equal_to_dicts(self) -> None:
+        agent = self._agent("final_answer")
+        agent.run("q")
+        self.assertEqual(agent.memory.steps[0], {"type": "query", "content": "q"})
+        self.assertEqual(agent.memory.last()[0]["content"]["tool"], "final_answer")
+        self.assertEqual(dict(agent.memory.steps[0]), {"type": "query", "content": "q"})
+        self.assertEqual(agent.memory.steps[0].get("content"), "q")
+
+    def test_one_trace_record_per_run(self) -> None:
+        agent = self._agent("kg_query")
+        agent.max_steps = 5
+        with self.assertLogs(core.logger, "INFO") as logs:
+            agent.run("q")
+            asyncio.run(agent.arun("other"))
+        traces = [record for record in logs.records if record.getMessage().startswith("Agent run ended")]
+        self.assertEqual(len(traces), 2)
+        self.assertIn("after 5 steps", traces[0].getMessage())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Tests for the indexed, dictionary-encoded KGExecutor store."""
+
+import asyncio
+import itertools
+import random
+import unittest
+
+from kg_agent import KGExecutor
+
+
+def _brute_force(triples, pattern):
+    return sorted(t for t in triples if all(q is None or q == v for q, v in zip(pattern, t)))
+
+
+class KGExecutorTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = random.Random(0)
+        self.data = [(rng.randint(0, 15), rng.choice("abcd"), rng.randint(0, 15)) for _ in range(400)]
+        self.kg = KGExecutor()
+        self.kg.load_triples(self.data)
+        self.unique = sorted(set(self.data))
+
+    def test_every_pattern_shape_matches_brute_force(self) -> None:
+        probes = self.unique[:40] + [(99, "z", 99), (0, "z", 0)]
+        for triple in probes:
+            for mask in itertools.product((True, False), repeat=3):
+                pattern = tuple(v if keep else None for v, keep in zip(triple, mask))
+                expected = _brute_force(self.unique, pattern)
+                with self.subTest(pattern=pattern):
+                    self.assertEqual(sorted(self.kg.query(pattern)), expected)
+                    self.assertEqual(self.kg.count(pattern), len(expected))
+                    self.assertEqual(self.kg.exists(pattern), bool(expected))
+
+    def test_duplicates_are_stored_once(self) -> None:
+        self.kg.load_triples(self.data[:50] + self.data[:50])
+        self.assertEqual(len(self.kg.triples), len(self.unique))
+        self.assertEqual(self.kg.count((None, None, None)), len(self.unique))
+
+    def test_incremental_loads_grow_storage(self) -> None:
+        kg = KGExecutor()
+        for i in range(0, len(self.data), 7):
+            kg.load_triples(self.data[i:i + 7])
+        self.assertEqual(sorted(kg.triples), self.unique)
+        self.assertEqual(sorted(kg.query((None, "a", None))), _brute_force(self.unique, (None, "a", None)))
+
+    def test_query_many_matches_query(self) -> None:
+        patterns = [(1, None, None), (None, "b", 3), (99, None, None)]
+        self.assertEqual(self.kg.query_many(patterns), [self.kg.query(p) for p in patterns])
+
+    def test_triples_is_read_only(self) -> None:
+        with self.assertRaises(AttributeError):
+            self.kg.triples.append((1, "a", 2))
+
+    def test_unhashable_terms_are_rejected(self) -> None:
+        with self.assertRaises(TypeError):
+            KGExecutor().load_triples([(["x"], "p", "o")])
+
+    def test_unhashable_query_terms_match_nothing(self) -> None:
+        self.assertEqual(self.kg.query((["x"], None, None)), [])
+        self.assertEqual(self.kg.query((1, "a", {"o": 2})), [])
+        self.assertEqual(self.kg.count((None, ["a"], None)), 0)
+        self.assertFalse(self.kg.exists((1, None, [2])))
+
+    def test_terms_of_different_types_stay_distinct(self) -> None:
+        kg = KGExecutor()
+        kg.load_triples([(1, "p", "o"), (1.0, "p", "o"), (True, "p", "o")])
+        self.assertEqual(len(kg.triples), 3)
+        for term in (1, 1.0, True):
+            with self.subTest(term=term):
+                (triple,) = kg.query((term, None, None))
+                self.assertIs(type(triple[0]), type(term))
+        self.assertEqual(kg.query((False, None, None)), [])
+
+    def test_blocking_backend_queries_run_on_the_io_pool_until_closed(self) -> None:
+        kg = KGExecutor(backend="remote")
+        kg.load_triples(self.data)
+
+        async def queries():
+            return await asyncio.gather(*(kg.aquery((None, p, None)) for p in "ab"))
+
+        self.assertEqual(asyncio.run(queries()), [kg.query((None, p, None)) for p in "ab"])
+        self.assertIsNotNone(kg._io_pool)
+        kg.close()
+        self.assertIsNone(kg._io_pool)
+        kg.close()
+        self.assertEqual(asyncio.run(kg.aquery((1, None, None))), kg.query((1, None, None)))
+        kg.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Tests for KnowledgeMemory and the read-only view handed to tools."""
+
+import copy
+import pickle
+import unittest
+
+from kg_agent import KnowledgeMemory
+
+
+class KnowledgeMemoryTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.memory = KnowledgeMemory()
+        self.memory.add_step("query", "who works at acme")
+        self.memory.add_step("tool_call", {"tool": "kg_query", "out": {"results": [["alice"]]}})
+
+    def test_view_is_read_only_and_tracks_memory(self) -> None:
+        view = self.memory.view()
+        with self.assertRaises(TypeError):
+            view["memory"] = []
+        self.memory.add_step("observation", "done")
+        self.assertEqual(len(view["memory"]), 3)
+        self.assertFalse(hasattr(view["memory"], "append"))
+
+    def test_steps_is_an_immutable_snapshot(self) -> None:
+        steps = self.memory.steps
+        self.assertIsInstance(steps, tuple)
+        self.memory.add_step("observation", "done")
+        self.assertEqual(len(steps), 2)
+        self.assertEqual(steps[0], {"type": "query", "content": "who works at acme"})
+
+    def test_seeded_with_steps(self) -> None:
+        seeded = KnowledgeMemory(steps=[{"type": "query", "content": "q"}])
+        self.assertEqual(seeded.last(), [{"type": "query", "content": "q"}])
+        self.assertEqual(len(seeded.view()["memory"]), 1)
+        self.assertEqual(KnowledgeMemory(steps=self.memory), self.memory)
+
+    def test_deepcopy_is_independent(self) -> None:
+        clone = copy.deepcopy(self.memory)
+        self.assertEqual(clone, self.memory)
+        clone.add_step("observation", "done")
+        self.assertEqual(len(self.memory), 2)
+        self.assertEqual(len(clone.view()["memory"]), 3)
+        self.assertEqual(len(self.memory.view()["memory"]), 2)
+
+    def test_pickle_round_trip(self) -> None:
+        restored = pickle.loads(pickle.dumps(self.memory))
+        self.assertEqual(restored, self.memory)
+        self.assertEqual(list(restored.view()["memory"]), list(self.memory))
+
+
+if __name__ == "__main__":
+    unittest.main()
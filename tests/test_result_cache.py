@@ -0,0 +1,108 @@
+"""Tests for the Agent's two-tier result cache."""
+
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+from kg_agent import Agent, KGExecutor, ToolBox
+from kg_agent import core
+
+
+class _CountingTool:
+    """Answers every instruction at once and counts how often it ran."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def execute(self, instruction, context=None):
+        self.calls += 1
+        return {"final": True, "answer": ["x"], "call": self.calls}
+
+
+_VECTORS = {
+    "who works at acme": [1.0, 0.0, 0.0],
+    "who is employed by acme": [0.99, 0.05, 0.0],
+    "where is acme": [0.0, 1.0, 0.0],
+}
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tool = _CountingTool()
+        self.toolbox = ToolBox()
+        self.toolbox.register("answer", self.tool)
+        self.kg = KGExecutor()
+        self.agent = Agent(toolbox=self.toolbox, kg_executor=self.kg, embed_fn=_VECTORS.__getitem__)
+
+    def test_exact_hit_skips_the_loop(self) -> None:
+        first = self.agent.run("Who works at ACME")
+        second = self.agent.run("  who   works at acme ")
+        self.assertEqual(self.tool.calls, 1)
+        self.assertEqual(second, first)
+        self.assertEqual([s["type"] for s in self.agent.memory.last(2)], ["query", "cached_result"])
+
+    def test_embedding_hit_reuses_a_paraphrase(self) -> None:
+        self.agent.run("who works at acme")
+        self.assertEqual(self.agent.run("who is employed by acme")["call"], 1)
+        self.assertEqual(self.agent.run("where is acme")["call"], 2)
+        self.assertEqual(self.tool.calls, 2)
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        agent = Agent(toolbox=self.toolbox, kg_executor=self.kg)
+        with mock.patch.object(core, "RESULT_CACHE_SIZE", 2):
+            agent.run("q1")
+            agent.run("q2")
+            agent.run("q1")
+            agent.run("q3")
+            self.assertEqual(self.tool.calls, 3)
+            agent.run("q1")
+            self.assertEqual(self.tool.calls, 3)
+            agent.run("q2")
+            self.assertEqual(self.tool.calls, 4)
+
+    def test_results_are_copied_on_store_and_hit(self) -> None:
+        first = self.agent.run("who works at acme")
+        first["answer"].append("mutated")
+        hit = self.agent.run("who works at acme")
+        self.assertEqual(hit["answer"], ["x"])
+        hit["answer"].append("mutated")
+        self.assertEqual(self.agent.run("who is employed by acme")["answer"], ["x"])
+
+    def test_load_triples_invalidates(self) -> None:
+        self.agent.run("who works at acme")
+        self.kg.load_triples([("alice", "works_at", "acme")])
+        self.agent.run("who works at acme")
+        self.assertEqual(self.tool.calls, 2)
+
+    def test_register_invalidates(self) -> None:
+        self.agent.run("who works at acme")
+        self.toolbox.register("other", _CountingTool())
+        self.agent.run("who is employed by acme")
+        self.assertEqual(self.tool.calls, 2)
+
+    def test_runs_without_a_result_are_not_cached(self) -> None:
+        agent = Agent(toolbox=ToolBox(), kg_executor=self.kg)
+        agent.max_steps = 1
+        with self.assertLogs(core.logger, "WARNING"):
+            self.assertIsNone(agent.run("q"))
+        self.assertEqual(len(agent._exact_cache), 0)
+
+    def test_arun_embeds_off_the_event_loop(self) -> None:
+        threads = []
+
+        def embed(text):
+            threads.append(threading.current_thread())
+            return _VECTORS[text]
+
+        agent = Agent(toolbox=self.toolbox, kg_executor=self.kg, embed_fn=embed)
+        asyncio.run(agent.arun("who works at acme"))
+        hit = asyncio.run(agent.arun("who is employed by acme"))
+        self.assertEqual(hit["call"], 1)
+        self.assertEqual(self.tool.calls, 1)
+        self.assertNotIn(threading.main_thread(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()